@@ -1,13 +1,27 @@
 import requests
 from requests.auth import HTTPBasicAuth
 import streamlit as st
-from PIL import Image
-import pytesseract
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+import os
 import io
-import base64
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from jira_core import SESSION, STATUS_COLORS, AuthError, credentials_namespace, jql_quote, parse_json, rate_limited_get
 
-# Configure Tesseract path for Streamlit Cloud
-pytesseract.pytesseract.tesseract_cmd = '/usr/bin/tesseract'
+# One core per OCR job; parallelism comes from OCR_WORKERS instead. Must be
+# set before tesserocr loads libtesseract: OpenMP reads it when it loads.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+try:
+    import tesserocr
+except ImportError:  # fall back to the pytesseract subprocess
+    tesserocr = None
+
+# Partial reruns need Streamlit 1.33+; older versions rerun the whole script
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
 
 # ========== CONSTANTS ==========
 PROJECT_LIST = [
@@ -24,6 +38,41 @@ TIME_FRAMES = {
     "Last year": 365,
     "All time": None
 }
+SEARCH_CACHE_TTL = 3600  # seconds
+SEARCH_CACHE_ENTRIES = 256
+# Issues per search request; Cloud clamps to 100, Data Center allows up to 1000
+SEARCH_PAGE_SIZE = 100
+# Every result is rendered as an expander on each rerun, so keep this small
+MAX_SEARCH_RESULTS = 100
+# Pages after the first are fetched in parallel; the rate limiter still paces them
+SEARCH_WORKERS = 4
+# Cached searches older than this are re-validated with a cheap count query
+FRESHNESS_CHECK_AFTER = 60  # seconds
+IMAGE_WORKERS = 8
+OCR_WORKERS = os.cpu_count() or 2
+OCR_CACHE_ENTRIES = 512
+# OCR text is also kept on disk (one small file per image hash) so it
+# survives restarts; counts against the host's disk quota on Streamlit Cloud,
+# so the least recently used files past OCR_CACHE_FILES are deleted
+OCR_CACHE_FILES = 10_000
+OCR_CACHE_DIR = os.environ.get(
+    "OCR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "jira-search", "ocr")
+)
+OCR_MAX_SIDE = 2000  # px; larger screenshots are scaled down before OCR
+# "OCR all" skips images unlikely to hold text: icons, avatars, flat fills
+OCR_MIN_BYTES = 8 * 1024
+OCR_MIN_PIXELS = 10_000
+OCR_MIN_CONTRAST = 32  # grayscale levels between the darkest and lightest pixel
+# Raster formats worth OCRing; SVG can't be decoded and GIFs are mostly animations
+OCR_MIME_TYPES = frozenset({"image/png", "image/jpeg", "image/tiff", "image/bmp", "image/webp"})
+THUMBNAIL_SIZE = (200, 200)
+PREVIEW_CACHE_ENTRIES = 1024  # previews are thumbnail-sized, a few KB each
+MAX_PREVIEW_BYTES = 10 * 1024 * 1024  # larger attachments aren't downloaded for preview
+DOWNLOAD_CHUNK = 64 * 1024
+# Only the fields the results list renders; project comes from the issue key.
+# The heavy fields are loaded per issue once its details are shown.
+SEARCH_FIELDS = "summary,created,status"
+DETAIL_FIELDS = "description,attachment"
 
 # ========== SESSION STATE MANAGEMENT ==========
 def init_session_state():
@@ -31,100 +80,532 @@ def init_session_state():
         st.session_state.zoom_image = None
     if 'search_results' not in st.session_state:
         st.session_state.search_results = None
+    if 'search_total' not in st.session_state:
+        st.session_state.search_total = 0
     if 'auth' not in st.session_state:
         st.session_state.auth = None
     if 'search_params' not in st.session_state:
         st.session_state.search_params = {}
     if 'available_statuses' not in st.session_state:
         st.session_state.available_statuses = []
+    if 'ocr_results' not in st.session_state:
+        st.session_state.ocr_results = {}
 
 # ========== CORE FUNCTIONS ==========
-def search_jira(base_url, auth, query, projects, time_frame, statuses=None):
-    jql = f'project IN ({",".join(f"\"{p}\"" for p in projects)})'
-    
+@lru_cache(maxsize=128)
+def build_jql(query, projects, time_frame, statuses=()):
+    """Filter JQL for the search form's inputs, without the ORDER BY"""
+    clauses = [f'project IN ({",".join(map(jql_quote, projects))})']
     if query:
-        jql += f' AND text ~ "{query}"'
-    
+        clauses.append(f'text ~ {jql_quote(query)}')
     if statuses:
-        jql += f' AND status IN ({",".join(f"\"{s}\"" for s in statuses)})'
-    
-    if time_frame in TIME_FRAMES and TIME_FRAMES[time_frame]:
-        jql += f' AND created >= -{TIME_FRAMES[time_frame]}d'
-    
-    jql += ' ORDER BY created DESC'
+        clauses.append(f'status IN ({",".join(map(jql_quote, statuses))})')
+    days = TIME_FRAMES.get(time_frame)
+    if days:
+        clauses.append(f'created >= -{days}d')
+    return " AND ".join(clauses)
+
+def search_jira(base_url, auth, query, projects, time_frame, statuses=None):
+    filter_jql = build_jql(query, tuple(projects), time_frame, tuple(statuses or ()))
+    jql = filter_jql + ' ORDER BY created DESC'
     
     try:
-        response = requests.get(
+        user_ns = credentials_namespace(auth)
+        
+        # A cached result is re-validated with a maxResults=0 probe; only if
+        # something changed is the full search re-run under a new revision
+        revisions = get_search_revisions()
+        cache_key = (base_url, jql, user_ns)
+        revision, validated_at = revisions.get(cache_key) or (0, 0)
+        result = _fetch_issues(base_url, jql, user_ns, revision, auth)
+        now = time.time()
+        if now - max(result["fetched_at"], validated_at) > FRESHNESS_CHECK_AFTER:
+            if _has_updates_since(base_url, filter_jql, result["fetched_at"], auth):
+                revision = now
+                result = _fetch_issues(base_url, jql, user_ns, revision, auth)
+            revisions.put(cache_key, (revision, now))
+        
+        return result["issues"], result["total"]
+    except AuthError:
+        raise
+    except Exception as e:
+        st.error(f"Jira API Error: {str(e)}")
+        return [], 0
+
+@st.cache_resource
+def get_search_revisions():
+    """Process-wide (base_url, jql, user_ns) -> (revision, validated_at).
+
+    Bounded like the search cache it tracks; an evicted entry just means
+    the next search starts from revision 0 and re-validates.
+    """
+    return LruCache(SEARCH_CACHE_ENTRIES)
+
+@st.cache_data(show_spinner=False, ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_ENTRIES)
+def _fetch_issues(base_url, jql, user_ns, revision, _auth):
+    """Fetch one JQL search, cached in memory across reruns and sessions.
+
+    Kept in memory rather than on disk: Streamlit only applies ``ttl`` and
+    ``max_entries`` to its in-memory layer, so persisted entries would pile
+    up forever. ``revision`` is bumped when a freshness probe finds updates;
+    superseded revisions age out via ttl and max_entries. ``user_ns`` keeps
+    users apart without storing the credentials. Errors raise, so they are
+    never cached.
+    The first page reports the total; the remaining pages up to
+    MAX_SEARCH_RESULTS are then fetched concurrently.
+    """
+    first = _search_page(base_url, jql, 0, _auth)
+    issues = first.get("issues", [])
+    # The server may clamp maxResults, so step by the page size it actually returned
+    step = len(issues)
+    wanted = min(first.get("total", 0), MAX_SEARCH_RESULTS)
+    if step and wanted > step:
+        offsets = range(step, wanted, step)
+        with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+            pages = pool.map(lambda start: _search_page(base_url, jql, start, _auth), offsets)
+            for data in pages:
+                issues.extend(data.get("issues", []))
+    return {
+        "issues": issues[:MAX_SEARCH_RESULTS],
+        "total": first.get("total", len(issues)),
+        "fetched_at": time.time()
+    }
+
+def _search_page(base_url, jql, start_at, auth):
+    """One page of a JQL search; runs in worker threads, so no st.* calls"""
+    response = rate_limited_get(
+        f"{base_url}/rest/api/2/search",
+        auth=auth,
+        params={
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": SEARCH_PAGE_SIZE,
+            "fields": SEARCH_FIELDS
+        },
+        timeout=15
+    )
+    # The search itself doubles as the credential check - no /myself probe
+    if response.status_code in (401, 403):
+        raise AuthError(f"HTTP {response.status_code}")
+    response.raise_for_status()
+    return parse_json(response)
+
+def get_issue_detail(base_url, key, auth):
+    """Description and attachments of one issue"""
+    return _fetch_issue_detail(base_url, key, credentials_namespace(auth), auth)
+
+@st.cache_data(show_spinner=False, ttl=SEARCH_CACHE_TTL, max_entries=1024)
+def _fetch_issue_detail(base_url, key, user_ns, _auth):
+    """The heavy issue fields, cached in memory the same way as searches"""
+    response = rate_limited_get(
+        f"{base_url}/rest/api/2/issue/{key}",
+        auth=_auth,
+        params={"fields": DETAIL_FIELDS},
+        timeout=15
+    )
+    if response.status_code in (401, 403):
+        raise AuthError(f"HTTP {response.status_code}")
+    response.raise_for_status()
+    return parse_json(response).get("fields", {})
+
+def _has_updates_since(base_url, filter_jql, since, auth):
+    """Ask Jira for just the count of matching issues updated since ``since``.
+
+    Relative minutes avoid JQL's per-user timezone for absolute dates. If
+    the probe itself fails, the cached result is kept.
+    """
+    minutes = int((time.time() - since) // 60) + 1
+    try:
+        response = rate_limited_get(
             f"{base_url}/rest/api/2/search",
             auth=auth,
             params={
-                "jql": jql,
-                "maxResults": 100,
-                "fields": "summary,description,attachment,created,updated,status,assignee,project"
+                "jql": f'({filter_jql}) AND updated >= -{minutes}m',
+                "maxResults": 0,
+                "fields": ""
             },
             timeout=15
         )
         response.raise_for_status()
-        return response.json().get("issues", [])
-    except Exception as e:
-        st.error(f"Jira API Error: {str(e)}")
-        return []
+        return parse_json(response).get("total", 0) > 0
+    except requests.RequestException:
+        return False
 
 def get_available_statuses(issues):
     """Extract unique statuses from search results"""
-    statuses = set()
-    for issue in issues:
-        statuses.add(issue['fields']['status']['name'])
-    return sorted(statuses)
+    return sorted({issue['fields']['status']['name'] for issue in issues})
+
+class LruCache:
+    """Thread-safe in-memory LRU, usable from worker threads"""
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+class OcrCache(LruCache):
+    """LRU of OCR text keyed by a hash of the image bytes.
+
+    Backed by one file per hash in ``directory``, so results survive
+    restarts; disk errors only cost a re-run of OCR. The directory is
+    capped at ``max_files``: reads refresh a file's mtime, and every
+    ``prune_every`` writes the oldest files past the cap are deleted.
+    """
+    def __init__(self, max_entries, directory=None, max_files=None, prune_every=100):
+        super().__init__(max_entries)
+        self.directory = directory
+        self.max_files = max_files
+        self.prune_every = prune_every
+        self.writes = 0
+
+    def get(self, digest):
+        text = super().get(digest)
+        if text is None:
+            text = self._read(digest)
+            if text is not None:
+                super().put(digest, text)
+        return text
+
+    def put(self, digest, text):
+        super().put(digest, text)
+        self._write(digest, text)
+
+    def _read(self, digest):
+        if not self.directory:
+            return None
+        try:
+            path = os.path.join(self.directory, digest + ".txt")
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # mtime doubles as last use for pruning
+            return text
+        except OSError:
+            return None
+
+    def _write(self, digest, text):
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, digest + ".txt")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees half a file
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self.lock:
+            # Prune on the first write too, to trim what earlier runs left
+            due = self.writes % self.prune_every == 0
+            self.writes += 1
+        if due:
+            self._prune()
+
+    def _prune(self):
+        if not self.max_files:
+            return
+        try:
+            with os.scandir(self.directory) as it:
+                files = sorted(
+                    (entry.stat().st_mtime, entry.path)
+                    for entry in it if entry.name.endswith(".txt")
+                )
+            for _, path in files[:max(0, len(files) - self.max_files)]:
+                os.remove(path)
+        except OSError:
+            pass
+
+@st.cache_resource
+def get_ocr_cache():
+    return OcrCache(OCR_CACHE_ENTRIES, OCR_CACHE_DIR, max_files=OCR_CACHE_FILES)
+
+OCR_CACHE = get_ocr_cache()
+
+@st.cache_resource
+def get_ocr_pool():
+    """Long-lived OCR threads, so each keeps its tesseract engine loaded"""
+    return ThreadPoolExecutor(max_workers=OCR_WORKERS)
 
-@st.cache_data(show_spinner=False)
-def extract_text(_auth_token, image_url):
+_TESSERACT = threading.local()
+
+@lru_cache(maxsize=None)
+def get_pytesseract():
+    """pytesseract, imported on first use; only needed without tesserocr"""
+    import pytesseract
+    
+    # Configure Tesseract path for Streamlit Cloud
+    pytesseract.pytesseract.tesseract_cmd = '/usr/bin/tesseract'
+    return pytesseract
+
+def recognize(img):
+    """OCR a PIL image, in-process via tesserocr when it is installed"""
+    if tesserocr is None:
+        return get_pytesseract().image_to_string(img, config="--oem 1")
+    # An engine isn't thread-safe, so each OCR thread loads its own once
+    api = getattr(_TESSERACT, "api", None)
+    if api is None:
+        api = _TESSERACT.api = tesserocr.PyTessBaseAPI(lang="eng", oem=tesserocr.OEM.LSTM_ONLY)
+    api.SetImage(img)
+    return api.GetUTF8Text()
+
+def prepare_for_ocr(img):
+    """Grayscale, cap the size and stretch contrast; tesseract's cost scales
+    with pixel count, and faint text (washed-out screenshots) costs it extra
+    segmentation passes."""
+    from PIL import Image, ImageOps
+    
+    img = img.convert("L")
+    scale = OCR_MAX_SIDE / max(img.size)
+    if scale < 1:
+        img = img.resize((int(img.width * scale), int(img.height * scale)), Image.Resampling.LANCZOS)
+    return ImageOps.autocontrast(img, cutoff=1)
+
+def looks_textless(img):
+    """Cheap pre-check: too small, or a flat fill with nothing drawn on it.
+
+    Mostly-white screenshots with a few lines of text have a near-uniform
+    histogram, so only the darkest-to-lightest range is checked: any text
+    leaves pixels far from the background.
+    """
+    if img.width * img.height < OCR_MIN_PIXELS:
+        return True
+    low, high = img.convert("L").getextrema()
+    return high - low < OCR_MIN_CONTRAST
+
+def download(url, auth, timeout, hasher=None):
+    """Stream a download into a buffer in DOWNLOAD_CHUNK pieces.
+
+    Unlike ``response.content`` this never holds the chunk list and the
+    joined bytes at once; ``hasher`` is fed along the way, so hashing needs
+    no second pass over the data.
+    """
+    buf = io.BytesIO()
+    with SESSION.get(url, auth=auth, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(DOWNLOAD_CHUNK):
+            buf.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+    buf.seek(0)
+    return buf
+
+def ocr_image(image_url, auth, screen=False):
+    """Download and OCR one image; raises on failure so it is safe in worker threads.
+
+    Results are cached by content hash, so the same screenshot attached to
+    several issues (or re-uploaded under a new URL) is only recognized once.
+    Each caller still downloads with its own credentials, so the cache never
+    hands text to someone who can't fetch the image. With ``screen``, images
+    that look textless return None without running OCR.
+    """
+    # Imported here so sessions that never run OCR don't pay for it
+    from PIL import Image
+    
+    hasher = hashlib.blake2b(digest_size=16)
+    buf = download(image_url, auth, timeout=15, hasher=hasher)
+    digest = hasher.hexdigest()
+    text = OCR_CACHE.get(digest)
+    if text is None:
+        img = Image.open(buf)
+        # JPEGs can decode straight to grayscale at a reduced scale, so the
+        # full-size RGB bitmap never exists; other formats ignore this
+        img.draft("L", (OCR_MAX_SIDE, OCR_MAX_SIDE))
+        if screen and looks_textless(img):
+            return None
+        text = recognize(prepare_for_ocr(img))
+        OCR_CACHE.put(digest, text)
+    return text
+
+def extract_text(auth, image_url):
     try:
-        username, password = _auth_token.split("|")
-        auth = HTTPBasicAuth(username, password)
-        
-        response = requests.get(image_url, auth=auth, timeout=15)
-        img = Image.open(io.BytesIO(response.content))
-        return pytesseract.image_to_string(img)
+        return get_ocr_pool().submit(ocr_image, image_url, auth).result()
     except Exception as e:
         st.error(f"OCR Error: {str(e)}")
         return ""
 
+def ocr_readable(att):
+    """Whether OCR can decode the attachment's format at all"""
+    return att['mimeType'] in OCR_MIME_TYPES
+
+def ocr_supported(att):
+    """Whether "OCR all" should try an attachment, judged from Jira's metadata alone"""
+    return ocr_readable(att) and att.get('size', OCR_MIN_BYTES) >= OCR_MIN_BYTES
+
+def extract_texts(attachments, auth, on_progress=None):
+    """OCR several images at once.
+
+    tesserocr releases the GIL while recognizing (and pytesseract runs a
+    separate process), so worker threads give one image per core. Images
+    unlikely to hold text are skipped. ``on_progress(done, total)`` is called
+    from the calling thread as each image finishes, so it may use st.*.
+    Returns ``(texts, errors, skipped)``; the first two are keyed by
+    attachment id.
+    """
+    texts, errors, skipped = {}, {}, []
+    pool = get_ocr_pool()
+    futures = {}
+    for att in attachments:
+        # Jira reports type and size, so these are skipped before downloading
+        if not ocr_supported(att):
+            skipped.append(att)
+        else:
+            futures[pool.submit(ocr_image, att['content'], auth, screen=True)] = att
+    for done, future in enumerate(as_completed(futures), 1):
+        att = futures[future]
+        if on_progress:
+            on_progress(done, len(futures))
+        try:
+            text = future.result()
+        except Exception as e:
+            errors[att['id']] = str(e)
+            continue
+        if text is None:
+            skipped.append(att)
+        else:
+            texts[att['id']] = text
+    return texts, errors, skipped
+
 # ========== IMAGE HANDLING ==========
-def get_image_base64(image_url, auth):
-    """Get base64 encoded image with error handling"""
+@st.cache_resource
+def get_preview_cache():
+    """Preview bytes keyed by (url, credentials namespace), shared across reruns"""
+    return LruCache(PREVIEW_CACHE_ENTRIES)
+
+PREVIEW_CACHE = get_preview_cache()
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=SEARCH_CACHE_TTL)
+def fetch_image_bytes(image_url, user_ns, _auth):
+    """Full attachment, fetched once for both the zoom view and its download button"""
+    return download(image_url, _auth, timeout=30).getvalue()
+
+def image_attachments(fields):
+    return [att for att in fields.get('attachment', [])
+            if att['mimeType'].startswith('image/')]
+
+def preview_url(att):
+    """Jira's server-rendered thumbnail where it has one, else the attachment"""
+    return att.get('thumbnail') or att['content']
+
+def make_thumbnail(data):
+    """Small WEBP preview, so full-size images are only decoded for the zoom view"""
+    from PIL import Image
+    
     try:
-        response = requests.get(image_url, auth=auth, timeout=10)
-        return base64.b64encode(response.content).decode("utf-8")
-    except Exception as e:
-        st.error(f"Failed to load image: {str(e)}")
-        return None
+        img = Image.open(io.BytesIO(data))
+    except OSError:  # e.g. SVG - let st.image handle the original
+        return data
+    img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    buf = io.BytesIO()
+    img.save(buf, "WEBP", quality=80)
+    return buf.getvalue()
+
+def fetch_preview(att, auth, user_ns):
+    """Preview-sized bytes for one attachment; raises on failure so it is safe in worker threads"""
+    key = (preview_url(att), user_ns)
+    preview = PREVIEW_CACHE.get(key)
+    if preview is None:
+        response = SESSION.get(key[0], auth=auth, timeout=10)
+        response.raise_for_status()
+        # Jira's thumbnails are already preview-sized; only originals need PIL
+        preview = response.content if 'thumbnail' in att else make_thumbnail(response.content)
+        PREVIEW_CACHE.put(key, preview)
+    return preview
+
+def fetch_images(attachments, auth):
+    """Download image previews concurrently.
 
-def show_image_with_zoom(image_base64, filename, key_suffix):
-    """Display image with reliable zoom functionality"""
-    if not image_base64:
+    Returns ``(images, errors)`` keyed by attachment id. Streamlit calls are
+    made only from this (the script) thread, never from the workers.
+    """
+    images, errors = {}, {}
+    # Jira reports each attachment's size, so oversized ones without a
+    # thumbnail are skipped up front
+    wanted = []
+    for att in attachments:
+        if 'thumbnail' not in att and att.get('size', 0) > MAX_PREVIEW_BYTES:
+            errors[att['id']] = f"{att['size'] / 1048576:.1f} MB is too large to preview"
+        else:
+            wanted.append(att)
+    if not wanted:
+        return images, errors
+    user_ns = credentials_namespace(auth)
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as pool:
+        futures = {pool.submit(fetch_preview, att, auth, user_ns): att for att in wanted}
+        for future in as_completed(futures):
+            att = futures[future]
+            try:
+                images[att['id']] = future.result()
+            except Exception as e:
+                errors[att['id']] = str(e)
+    return images, errors
+
+def show_image_with_zoom(preview, att, auth):
+    """Display a preview; the full image is only downloaded once zoomed"""
+    if not preview:
         return
     
-    # Create unique keys for each image
-    zoom_key = f"zoom_{key_suffix}"
+    key_suffix = att['id']
     
-    # Check if we should show zoomed view
-    if st.session_state.get(zoom_key, False):
+    # One image is zoomed at a time; zoom_image holds its attachment id
+    if st.session_state.zoom_image == key_suffix:
         # Display the zoomed image with a close button
         col1, col2 = st.columns([1, 4])
         with col1:
             if st.button("◄ Back", key=f"back_{key_suffix}"):
-                st.session_state[zoom_key] = False
+                st.session_state.zoom_image = None
                 st.rerun()
         with col2:
-            st.image(base64.b64decode(image_base64), use_container_width=True)
+            try:
+                full_image = fetch_image_bytes(att['content'], credentials_namespace(auth), auth)
+            except Exception as e:
+                st.error(f"Failed to load image: {str(e)}")
+                return
+            st.image(full_image, use_container_width=True)
+            st.download_button(
+                f"Download {att['filename']}",
+                data=full_image,
+                file_name=att['filename'],
+                key=f"dl_{key_suffix}"
+            )
     else:
-        # Display thumbnail that can be clicked to zoom
-        if st.image(base64.b64decode(image_base64), width=200, 
-                   caption=f"Click to zoom: {filename}"):
-            st.session_state[zoom_key] = True
+        st.image(preview, width=200, caption=att['filename'])
+        if st.button("🔍 Zoom", key=f"zoombtn_{key_suffix}"):
+            st.session_state.zoom_image = key_suffix
             st.rerun()
 
+@fragment
+def show_ocr(att, auth):
+    """OCR button and result for one attachment; a click reruns only this part"""
+    # An explicit click is never screened by size - small crops often hold text
+    readable = ocr_readable(att)
+    if st.button(f"Run OCR on {att['filename']}", 
+               key=f"ocr_{att['id']}",
+               disabled=not readable,
+               help=None if readable else "Not an image format OCR can read"):
+        with st.spinner("Extracting text..."):
+            st.session_state.ocr_results[att['id']] = extract_text(auth, att['content'])
+    if att['id'] in st.session_state.ocr_results:
+        st.text_area("Extracted Text", 
+                    st.session_state.ocr_results[att['id']], 
+                    height=150,
+                    key=f"text_{att['id']}")
+
 # ========== MAIN UI ==========
 def main():
     st.title("🔍 Jira Search with OCR")
@@ -223,17 +704,23 @@ def main():
                 }
                 
                 with st.spinner("Searching Jira..."):
-                    results = search_jira(
-                        base_url,
-                        st.session_state.auth,
-                        query,
-                        selected_projects,
-                        time_frame,
-                        selected_statuses
-                    )
+                    try:
+                        results, total = search_jira(
+                            base_url,
+                            st.session_state.auth,
+                            query,
+                            selected_projects,
+                            time_frame,
+                            selected_statuses
+                        )
+                    except AuthError:
+                        st.session_state.search_results = None
+                        st.error("Authentication failed - check your username and password")
+                        st.stop()
                     
                     if results:
                         st.session_state.search_results = results
+                        st.session_state.search_total = total
                         st.session_state.available_statuses = get_available_statuses(results)
                         # Auto-select all statuses when getting new results
                         st.session_state.search_params["selected_statuses"] = st.session_state.available_statuses.copy()
@@ -243,74 +730,99 @@ def main():
 
     # Results Display (on same page)
     if st.session_state.search_results:
-        st.success(f"Found {len(st.session_state.search_results)} issues")
+        shown = len(st.session_state.search_results)
+        if st.session_state.search_total > shown:
+            st.warning(f"Showing the {shown} most recent of {st.session_state.search_total} "
+                       "matching issues - narrow the search to see the rest")
+        else:
+            st.success(f"Found {shown} issues")
+        
+        # Status is filtered in the JQL itself, so every result already matches
+        results = st.session_state.search_results
         
-        # Filter results by status if needed
-        filtered_results = st.session_state.search_results
-        if st.session_state.search_params.get("selected_statuses"):
-            filtered_results = [
-                issue for issue in filtered_results 
-                if issue['fields']['status']['name'] in st.session_state.search_params["selected_statuses"]
-            ]
-        st.info(f"Showing {len(filtered_results)} matches after filtering")
+        # Details are only loaded for issues whose toggle is on
+        base_url = st.session_state.search_params.get("base_url", "")
+        details, detail_errors = {}, {}
+        for issue in results:
+            if st.session_state.get(f"details_{issue['key']}"):
+                try:
+                    details[issue['key']] = get_issue_detail(base_url, issue['key'], st.session_state.auth)
+                except AuthError:
+                    st.error("Authentication failed - check your username and password")
+                    st.stop()
+                except Exception as e:
+                    detail_errors[issue['key']] = str(e)
         
-        for issue in filtered_results:
-            with st.expander(f"{issue['key']}: {issue['fields']['summary']}"):
+        # Fetch the previews for every opened issue in one concurrent pass
+        images, image_errors = fetch_images(
+            [att for fields in details.values() for att in image_attachments(fields)],
+            st.session_state.auth
+        )
+        
+        for issue in results:
+            key, basic = issue['key'], issue['fields']
+            with st.expander(f"{key}: {basic['summary']}"):
                 # Basic issue info
                 cols = st.columns(3)
                 with cols[0]:
-                    st.write(f"**Project:** {issue['key'].split('-')[0]}")
+                    st.write(f"**Project:** {key.split('-')[0]}")
                 with cols[1]:
-                    st.write(f"**Created:** {issue['fields']['created'][:10]}")
+                    st.write(f"**Created:** {basic['created'][:10]}")
                 with cols[2]:
-                    status = issue['fields']['status']['name']
-                    color = "green" if status == "Done" else "orange" if status == "In Progress" else "gray"
-                    st.markdown(f"**Status:** <span style='color:{color}'>{status}</span>", 
-                               unsafe_allow_html=True)
+                    status = basic['status']['name']
+                    color = STATUS_COLORS.get(status, "gray")
+                    st.markdown(f"**Status:** :{color}[{status}]")
+                
+                if not st.toggle("Show description and attachments", key=f"details_{key}"):
+                    continue
+                if key in detail_errors:
+                    st.error(f"Failed to load details: {detail_errors[key]}")
+                    continue
+                fields = details[key]
                 
                 # Description
                 st.write("**Description:**")
-                st.write(issue['fields'].get('description', 'No description'))
+                st.write(fields.get('description') or 'No description')
                 
                 # Attachments
-                if 'attachment' in issue['fields']:
+                if 'attachment' in fields:
                     st.subheader("Attachments")
-                    for att in issue['fields']['attachment']:
-                        if att['mimeType'].startswith('image/'):
-                            with st.container(border=True):
-                                st.write(f"**{att['filename']}**")
-                                
-                                # Get image data
-                                image_base64 = get_image_base64(att['content'], st.session_state.auth)
-                                
-                                # Display image with zoom
-                                if image_base64:
-                                    show_image_with_zoom(
-                                        image_base64, 
-                                        att['filename'],
-                                        att['id']  # Unique key suffix
-                                    )
-                                
-                                # OCR functionality
-                                if st.session_state.search_params.get("search_images", False):
-                                    if st.button(f"Run OCR on {att['filename']}", 
-                                               key=f"ocr_{att['id']}"):
-                                        with st.spinner("Extracting text..."):
-                                            auth_token = f"{st.session_state.auth.username}|{st.session_state.auth.password}"
-                                            text = extract_text(auth_token, att['content'])
-                                            st.text_area("Extracted Text", 
-                                                        text, 
-                                                        height=150,
-                                                        key=f"text_{att['id']}")
-                                
-                                # Download button
-                                if image_base64:
-                                    st.download_button(
-                                        f"Download {att['filename']}",
-                                        data=base64.b64decode(image_base64),
-                                        file_name=att['filename'],
-                                        key=f"dl_{att['id']}"
-                                    )
+                    image_atts = image_attachments(fields)
+                    
+                    ocr_enabled = st.session_state.search_params.get("search_images", False)
+                    if ocr_enabled and len(image_atts) > 1:
+                        if st.button(f"Run OCR on all {len(image_atts)} images",
+                                     key=f"ocr_all_{key}"):
+                            progress = st.progress(0.0, text="Extracting text...")
+                            texts, ocr_errors, skipped = extract_texts(
+                                image_atts, st.session_state.auth,
+                                on_progress=lambda done, total: progress.progress(
+                                    done / total, text=f"Extracted {done} of {total} images")
+                            )
+                            progress.empty()
+                            st.session_state.ocr_results.update(texts)
+                            if skipped:
+                                st.caption("Skipped (no text expected): " +
+                                           ", ".join(att['filename'] for att in skipped))
+                            for att in image_atts:
+                                if att['id'] in ocr_errors:
+                                    st.error(f"OCR Error ({att['filename']}): {ocr_errors[att['id']]}")
+                    for att in image_atts:
+                        with st.container(border=True):
+                            st.write(f"**{att['filename']}**")
+                            
+                            # Get image data
+                            preview = images.get(att['id'])
+                            if att['id'] in image_errors:
+                                st.error(f"Failed to load image: {image_errors[att['id']]}")
+                            
+                            # Display image with zoom
+                            if preview:
+                                show_image_with_zoom(preview, att, st.session_state.auth)
+                            
+                            # OCR functionality
+                            if ocr_enabled:
+                                show_ocr(att, st.session_state.auth)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,144 @@
+"""Jira plumbing shared by the search apps: HTTP session, rate limiting, auth helpers"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+import streamlit as st
+import threading
+import time
+import hashlib
+
+try:
+    import orjson
+except ImportError:  # fall back to requests' stdlib json
+    orjson = None
+
+# ========== CONSTANTS ==========
+# Pacing only starts once Jira answers 429; until then requests go straight out
+MAX_REQUESTS_PER_MINUTE = 30
+BURST_CAPACITY = 5
+# Retries of a 429 after the bucket has backed off; bounds the wait at ~12 s
+RATE_LIMIT_RETRIES = 2
+# Badge colors for status names; anything else is shown gray
+STATUS_COLORS = {"Done": "green", "In Progress": "orange"}
+
+# ========== HTTP SESSION ==========
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Pooled keep-alive session shared by every rerun and user.
+
+    Auth is passed per request and never stored on the session, so it is
+    safe to share across users.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        # 429 is left to the token bucket, which paces every thread instead
+        # of sleeping on one; Retry-After is ignored so a 503 can't stall the
+        # script thread for however long the server asks
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Adds "br" to gzip/deflate only when a brotli decoder is installed
+    session.headers.update(make_headers(accept_encoding=True))
+    return session
+
+SESSION = get_http_session()
+
+def parse_json(response):
+    """Decode a JSON response body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# ========== RATE LIMITING ==========
+class TokenBucket:
+    """Adaptive token bucket that stays idle until Jira pushes back.
+
+    Requests pass freely while the refill rate is at its ceiling. A 429
+    halves the rate and empties the bucket, after which callers are paced
+    (bursting up to capacity); successes raise the rate additively until it
+    is back at the ceiling and pacing stops again.
+    """
+    def __init__(self, capacity, rate, min_rate=0.1, increase=0.05):
+        self.capacity = capacity
+        self.tokens = capacity
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping only while backing off and the bucket is empty"""
+        with self.lock:
+            if self.rate >= self.max_rate:
+                return
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return
+            # Reserve the token now so concurrent callers queue up behind us
+            sleep_for = -self.tokens / self.rate
+        time.sleep(sleep_for)
+
+    def record(self, status_code):
+        """AIMD: back off multiplicatively on 429, recover additively on success"""
+        with self.lock:
+            if status_code == 429:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.tokens = 0
+                self.last = time.monotonic()
+            elif status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+@st.cache_resource(show_spinner=False)
+def get_rate_limiter():
+    return TokenBucket(capacity=BURST_CAPACITY, rate=MAX_REQUESTS_PER_MINUTE / 60)
+
+BUCKET = get_rate_limiter()
+
+def rate_limited_get(url, **kwargs):
+    """GET a Jira API URL through the shared session and rate limiter.
+
+    A 429 halves the bucket's rate; the request is then retried once the
+    bucket lets it through, up to RATE_LIMIT_RETRIES times. The last
+    response is returned either way.
+    """
+    for _ in range(RATE_LIMIT_RETRIES + 1):
+        BUCKET.acquire()
+        response = SESSION.get(url, **kwargs)
+        BUCKET.record(response.status_code)
+        if response.status_code != 429:
+            break
+    return response
+
+# ========== AUTH & JQL ==========
+class AuthError(Exception):
+    """Raised when Jira rejects the supplied credentials (401/403)"""
+
+def credentials_namespace(auth):
+    """Cache namespace derived from username *and* password.
+
+    Keying on the username alone would let a wrong password read another
+    session's cached results for that user.
+    """
+    secret = f"{auth.username}\0{auth.password}".encode()
+    return hashlib.sha256(secret).hexdigest()[:16]
+
+_JQL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"'})
+
+def jql_quote(value):
+    """Quote a value as a JQL string literal"""
+    return '"' + value.translate(_JQL_ESCAPES) + '"'
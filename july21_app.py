@@ -1,8 +1,10 @@
-import requests
 from requests.auth import HTTPBasicAuth
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import pandas as pd
+from jira_core import STATUS_COLORS, AuthError, credentials_namespace, jql_quote, parse_json, rate_limited_get
 
 # ========== PAGE CONFIG ==========
 st.set_page_config(
@@ -13,48 +15,273 @@ st.set_page_config(
 
 # ========== CONSTANTS ==========
 RESULTS_PER_PAGE = 10
+# Issues requested per Jira call; servers may clamp this (see page_cap).
+# Further batches are only fetched when paging past what is loaded.
+PAGE_SIZE = 100
+SEARCH_CACHE_TTL = 300  # seconds
+# Only the fields the results view renders; project comes from the issue key.
+# Descriptions are bulky, so they are fetched separately for the page on screen.
+SEARCH_FIELDS = "summary,status,labels,updated"
+DETAIL_FIELDS = "description"
+DATE_FILTERS = {
+    "All": None,
+    "Last 7 days": 7,
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+    "Last 1 year": 365
+}
+# Filter spec: (projects, statuses, days); empty/None means unconstrained
+NO_FILTERS = ((), (), None)
 
 # ========== SESSION STATE ==========
 if 'raw_results' not in st.session_state:
     st.session_state.raw_results = []
 if 'filtered_results' not in st.session_state:
     st.session_state.filtered_results = []
+if 'results_df' not in st.session_state:
+    st.session_state.results_df = None
+if 'facets' not in st.session_state:
+    st.session_state.facets = ([], [])
 if 'page' not in st.session_state:
     st.session_state.page = 1
 if 'auth_verified' not in st.session_state:
     st.session_state.auth_verified = False
+if 'total_results' not in st.session_state:
+    st.session_state.total_results = 0
+if 'last_query' not in st.session_state:
+    st.session_state.last_query = None
+if 'last_jql' not in st.session_state:
+    st.session_state.last_jql = None
+if 'loaded_filters' not in st.session_state:
+    st.session_state.loaded_filters = NO_FILTERS
+if 'page_cap' not in st.session_state:
+    st.session_state.page_cap = {}
+if 'prefetch' not in st.session_state:
+    st.session_state.prefetch = None
 
 # ========== CORE FUNCTIONS ==========
-def search_jira(base_url, query, auth, max_results=100):
-    jql = f'text ~ "{query}" ORDER BY updated DESC'
+@lru_cache(maxsize=128)
+def build_jql(query, projects=(), statuses=(), days=None):
+    """Search JQL with the result filters pushed down to Jira's index"""
+    clauses = [f'text ~ {jql_quote(query)}']
+    if projects:
+        clauses.append(f'project in ({", ".join(map(jql_quote, projects))})')
+    if statuses:
+        clauses.append(f'status in ({", ".join(map(jql_quote, statuses))})')
+    if days:
+        clauses.append(f'updated >= -{days}d')
+    return " AND ".join(clauses) + " ORDER BY updated DESC"
+
+def search_jira(base_url, jql, auth, start_at=0, max_results=PAGE_SIZE):
+    """Fetch one page of results; returns Jira's payload (issues, total, maxResults)"""
+    user_ns = credentials_namespace(auth)
+    return _fetch_search_page(base_url, jql, start_at, max_results, user_ns, auth)
+
+def get_descriptions(base_url, keys, auth):
+    """Descriptions for the issues on screen, in one batched call per page"""
+    jql = f'key in ({", ".join(keys)})'
+    user_ns = credentials_namespace(auth)
+    # "warn" keeps one deleted or hidden key from failing the whole page with a 400
+    data = _fetch_search_page(base_url, jql, 0, len(keys), user_ns, auth,
+                              fields=DETAIL_FIELDS, validate_query="warn")
+    return {issue['key']: issue['fields'].get('description') for issue in data.get("issues", [])}
+
+@st.cache_data(show_spinner=False, ttl=SEARCH_CACHE_TTL, max_entries=256)
+def _fetch_search_page(base_url, jql, start_at, max_results, user_ns, _auth,
+                       fields=SEARCH_FIELDS, validate_query="strict"):
+    """One search page, cached in memory across reruns and sessions.
+
+    Not persisted to disk: Streamlit applies ``ttl`` and ``max_entries``
+    only in memory, so disk entries would never be evicted. ``user_ns``
+    keeps users apart without storing the credentials. Errors raise, so
+    they are never cached.
+    """
     url = f"{base_url}/rest/api/2/search"
     params = {
         "jql": jql,
+        "startAt": start_at,
         "maxResults": max_results,
-        "fields": "summary,description,status,labels,project,updated,attachment,key"
+        "fields": fields,
+        "validateQuery": validate_query
     }
-    response = requests.get(url, params=params, auth=auth, timeout=30)
+    response = rate_limited_get(url, params=params, auth=_auth, timeout=30)
+    # The search itself doubles as the credential check - no /myself probe
+    if response.status_code in (401, 403):
+        raise AuthError(f"HTTP {response.status_code}")
     response.raise_for_status()
-    return response.json().get("issues", [])
+    return parse_json(response)
+
+def get_page_size(base_url):
+    """Page size to request from this server, learned from earlier responses"""
+    return st.session_state.page_cap.get(base_url, PAGE_SIZE)
+
+def remember_page_cap(base_url, data):
+    """Jira silently clamps maxResults; cache the effective cap per server"""
+    cap = data.get("maxResults")
+    if cap and cap < PAGE_SIZE:
+        st.session_state.page_cap[base_url] = cap
+
+def more_on_server(days=None):
+    """True while Jira may hold more matches than have been loaded.
+
+    Results come newest-updated first, so once the loaded batch reaches past
+    a ``days`` window, nothing further on the server can fall inside it.
+    """
+    raw_results = st.session_state.raw_results
+    if days and raw_results:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        if raw_results[-1]['updated'] <= cutoff:
+            return False
+    return len(raw_results) < st.session_state.total_results
+
+def filters_cover(loaded, wanted):
+    """True if every issue matching ``wanted`` also matches ``loaded``"""
+    (l_projects, l_statuses, l_days), (w_projects, w_statuses, w_days) = loaded, wanted
+    return (
+        (not l_projects or bool(w_projects) and set(w_projects) <= set(l_projects))
+        and (not l_statuses or bool(w_statuses) and set(w_statuses) <= set(l_statuses))
+        and (l_days is None or w_days is not None and w_days <= l_days)
+    )
+
+def needs_server_filter(loaded, wanted):
+    """True if the loaded batch can't answer ``wanted`` and Jira must be queried.
+
+    A narrower time window is always a prefix of the loaded (newest-first)
+    results, so it is sliced locally and paging fetches the rest. Project and
+    status narrowing are only answered locally once every candidate is loaded.
+    """
+    if not filters_cover(loaded, wanted):
+        return True
+    return wanted[:2] != loaded[:2] and more_on_server()
+
+def run_search(base_url, auth, query, filters=NO_FILTERS):
+    """Fetch the first batch for ``query`` and replace the loaded results"""
+    jql = build_jql(query, *filters)
+    data = search_jira(base_url, jql, auth, max_results=get_page_size(base_url))
+    remember_page_cap(base_url, data)
+    issues = normalize_issues(data.get("issues", []))
+    # Facets come from the unfiltered search so narrowing never hides options
+    store_results(issues, refresh_facets=filters == NO_FILTERS)
+    st.session_state.total_results = data.get("total", len(issues))
+    st.session_state.last_query = query
+    st.session_state.last_jql = jql
+    st.session_state.loaded_filters = filters
+    st.session_state.prefetch = None
+    st.session_state.page = 1
+
+@st.cache_resource
+def get_prefetch_pool():
+    return ThreadPoolExecutor(max_workers=2)
+
+def prefetch_next_batch(base_url, auth):
+    """Start fetching the next batch in the background while the user reads.
+
+    The worker only calls search_jira, which never touches session state;
+    the Future is kept here and claimed by fetch_next_batch.
+    """
+    key = (st.session_state.last_jql, len(st.session_state.raw_results))
+    prefetch = st.session_state.prefetch
+    if prefetch is not None and prefetch[0] == key:
+        return
+    future = get_prefetch_pool().submit(search_jira, base_url, key[0], auth,
+                                        key[1], get_page_size(base_url))
+    st.session_state.prefetch = (key, future)
+
+def fetch_next_batch(base_url, auth):
+    """Append the next batch from Jira, starting after the issues loaded so far"""
+    loaded = len(st.session_state.raw_results)
+    key = (st.session_state.last_jql, loaded)
+    prefetch, st.session_state.prefetch = st.session_state.prefetch, None
+    with st.spinner("Loading more results..."):
+        try:
+            if prefetch is not None and prefetch[0] == key:
+                data = prefetch[1].result()
+            else:
+                data = search_jira(base_url, st.session_state.last_jql, auth,
+                                   start_at=loaded, max_results=get_page_size(base_url))
+        except Exception as e:
+            st.error(f"Search failed: {str(e)}")
+            return False
+    remember_page_cap(base_url, data)
+    # Facets from a filtered search would shrink the filter options and reset them
+    store_results(st.session_state.raw_results + normalize_issues(data.get("issues", [])),
+                  refresh_facets=st.session_state.loaded_filters == NO_FILTERS)
+    st.session_state.total_results = data.get("total", st.session_state.total_results)
+    return True
 
 def parse_jira_date(date_str):
     """Handle Jira's date format with timezone awareness"""
     try:
-        # Remove milliseconds if present
-        if '.' in date_str:
-            date_str = date_str.split('.')[0] + date_str[-6:]  # Keep timezone
-        
-        # Handle different timezone formats
-        if date_str.endswith('Z'):
-            return datetime.fromisoformat(date_str[:-1] + '+00:00').astimezone()
-        elif '+' in date_str or '-' in date_str[-6:]:
-            return datetime.fromisoformat(date_str).astimezone()
-        else:
-            return datetime.fromisoformat(date_str + '+00:00').astimezone()
+        return _parse_jira_date(date_str)
     except ValueError as e:
         st.error(f"Error parsing date: {date_str} - {str(e)}")
         return datetime.now(timezone.utc)  # Fallback to current time
 
+@lru_cache(maxsize=8192)
+def _parse_jira_date(date_str):
+    """Parse one Jira timestamp; raises ValueError, so failures are never cached"""
+    # Fast path for Jira's canonical "2024-01-02T15:04:05.123+0000"
+    if len(date_str) == 28 and date_str[10] == 'T' and date_str[23] in '+-':
+        sign = -1 if date_str[23] == '-' else 1
+        offset = timedelta(hours=int(date_str[24:26]), minutes=int(date_str[26:28]))
+        return datetime(
+            int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+            int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+            int(date_str[20:23]) * 1000, timezone(sign * offset)
+        ).astimezone()
+    
+    # Remove fractional seconds, keeping whatever zone follows them
+    head, _, tail = date_str.partition('.')
+    if tail:
+        date_str = head + tail.lstrip('0123456789')
+    
+    # Normalize the zone to the "+HH:MM" form fromisoformat accepts
+    if date_str.endswith('Z'):
+        date_str = date_str[:-1] + '+00:00'
+    elif len(date_str) > 19 and date_str[-5] in '+-':
+        date_str = date_str[:-2] + ':' + date_str[-2:]
+    
+    parsed = datetime.fromisoformat(date_str)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone()
+
+def normalize_issues(issues):
+    """Flatten Jira issues into the slim rows the UI reads, once at fetch time"""
+    rows = []
+    for issue in issues:
+        fields = issue['fields']
+        rows.append({
+            'key': issue['key'],
+            'project': issue['key'].partition('-')[0],
+            'summary': fields['summary'],
+            'status': fields['status']['name'],
+            'updated': parse_jira_date(fields['updated']),
+            'labels': fields.get('labels') or [],
+        })
+    return rows
+
+def build_results_frame(issues):
+    """The slim rows as a DataFrame, so filters run as vectorized masks"""
+    df = pd.DataFrame(issues, columns=["key", "project", "summary", "status", "updated", "labels"])
+    df["updated"] = pd.to_datetime(df["updated"], utc=True)
+    return df
+
+def extract_facets(issues):
+    """Collect the project and status filter options in a single pass"""
+    projects, statuses = set(), set()
+    for issue in issues:
+        projects.add(issue['project'])
+        statuses.add(issue['status'])
+    return sorted(projects), sorted(statuses)
+
+def store_results(issues, refresh_facets=True):
+    """Keep fetched issues plus everything derived from them in session state"""
+    st.session_state.raw_results = issues
+    st.session_state.results_df = build_results_frame(issues)
+    if refresh_facets:
+        st.session_state.facets = extract_facets(issues)
+
 # ========== UI COMPONENTS ==========
 def show_search_form():
     with st.form("main_search"):
@@ -65,10 +292,11 @@ def show_search_form():
             return query.strip()
     return None
 
-def show_results_filters(issues):
+def show_results_filters():
+    """Render the filter widgets and return the selection as a filter spec"""
     with st.expander("🔍 Filter Results", expanded=True):
-        # Extract all unique project types from results
-        projects = sorted(list({issue['key'].split('-')[0] for issue in issues}))
+        # Filter options are computed once per fetch, not per rerun
+        projects, statuses = st.session_state.facets
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -80,86 +308,99 @@ def show_results_filters(issues):
         with col2:
             date_options = st.selectbox(
                 "Updated Timeframe",
-                options=["All", "Last 7 days", "Last 30 days", "Last 90 days", "Last 1 year"],
+                options=list(DATE_FILTERS),
                 index=0
             )
         with col3:
-            statuses = sorted(list({issue['fields']['status']['name'] for issue in issues}))
             selected_statuses = st.multiselect(
                 "Status",
                 options=statuses,
                 default=statuses
             )
-        
-        # Apply filters
-        filtered = issues
-        if selected_projects:
-            filtered = [i for i in filtered if i['key'].split('-')[0] in selected_projects]
-        if date_options != "All":
-            days_map = {
-                "Last 7 days": 7,
-                "Last 30 days": 30,
-                "Last 90 days": 90,
-                "Last 1 year": 365
-            }
-            days = days_map[date_options]
-            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-            filtered = [i for i in filtered if parse_jira_date(i['fields']['updated']) > cutoff]
-        if selected_statuses:
-            filtered = [i for i in filtered if i['fields']['status']['name'] in selected_statuses]
-        
-        return filtered
+    
+    # Everything (or nothing) selected means no constraint
+    return (
+        tuple(selected_projects) if set(selected_projects) != set(projects) else (),
+        tuple(selected_statuses) if set(selected_statuses) != set(statuses) else (),
+        DATE_FILTERS[date_options]
+    )
+
+def apply_filters(df, filters):
+    """Filter the loaded batch as one vectorized mask"""
+    projects, statuses, days = filters
+    mask = pd.Series(True, index=df.index)
+    if projects:
+        mask &= df['project'].isin(projects)
+    if days:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        mask &= df['updated'] > cutoff
+    if statuses:
+        mask &= df['status'].isin(statuses)
+    return df[mask]
+
+@lru_cache(maxsize=1024)
+def preview_description(desc):
+    return desc[:250] + ("..." if len(desc) > 250 else "")
 
-def display_results(issues, base_url):
+def display_results(issues, base_url, auth):
     start = (st.session_state.page - 1) * RESULTS_PER_PAGE
     end = start + RESULTS_PER_PAGE
+    page = issues.iloc[start:end]
     
-    for issue in issues[start:end]:
-        project = issue['key'].split('-')[0]
-        status = issue['fields']['status']['name']
-        updated_date = parse_jira_date(issue['fields']['updated'])
+    descriptions = {}
+    if auth is not None:
+        try:
+            descriptions = get_descriptions(base_url, tuple(page['key']), auth)
+        except Exception as e:
+            st.warning(f"Could not load descriptions: {str(e)}")
+    
+    for issue in page.itertuples(index=False):
+        status = issue.status
         
         with st.container(border=True):
             # Header
-            st.markdown(f"""
-            <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
-                <h3 style="margin: 0;">{issue['key']}: {issue['fields']['summary']}</h3>
-                <div>
-                    <span style="background: #e0e0e0; padding: 3px 8px; border-radius: 4px;">
-                        {project}
-                    </span>
-                    <span style="color: {'green' if status == 'Done' else 'orange'}; margin-left: 10px;">
-                        {status}
-                    </span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            col_title, col_meta = st.columns([4, 1])
+            col_title.subheader(f"{issue.key}: {issue.summary}", anchor=False)
+            color = STATUS_COLORS.get(status, 'gray')
+            col_meta.markdown(f"`{issue.project}` :{color}[{status}]")
             
-            # Body
+            # Body - one element per column keeps the per-rerun element count low
             cols = st.columns([3, 1])
-            with cols[0]:
-                desc = issue['fields'].get('description', 'No description available')
-                st.text(desc[:250] + ("..." if len(desc) > 250 else ""))
-                
-                if 'labels' in issue['fields'] and issue['fields']['labels']:
-                    st.text("Labels: " + ", ".join(issue['fields']['labels']))
-                
-            with cols[1]:
-                st.markdown(f"**Updated:** {updated_date.strftime('%Y-%m-%d')}")
-                st.markdown(f"[Open in Jira ↗]({base_url}/browse/{issue['key']})", unsafe_allow_html=True)
-
-def show_pagination(total_items):
+            desc = descriptions.get(issue.key) or 'No description available'
+            body = preview_description(desc)
+            if issue.labels:
+                body += "\n\nLabels: " + ", ".join(issue.labels)
+            cols[0].text(body)
+            cols[1].markdown(
+                f"**Updated:** {issue.updated.to_pydatetime().astimezone():%Y-%m-%d}  \n"
+                f"[Open in Jira ↗]({base_url}/browse/{issue.key})"
+            )
+
+def show_pagination(total_items, base_url, auth, days=None):
     total_pages = (total_items + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
-    if total_pages > 1:
+    # Pages past the loaded batch are fetched from Jira on demand
+    can_fetch = auth is not None and more_on_server(days)
+    if total_pages > 1 or can_fetch:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col1:
             if st.button("◀ Previous") and st.session_state.page > 1:
                 st.session_state.page -= 1
+                st.rerun()
         with col2:
-            st.markdown(f"**Page {st.session_state.page} of {total_pages}**", unsafe_allow_html=True)
+            pages_label = f"{total_pages}+" if can_fetch else total_pages
+            st.markdown(f"**Page {st.session_state.page} of {pages_label}**")
         with col3:
-            if st.button("Next ▶") and st.session_state.page < total_pages:
-                st.session_state.page += 1
+            if st.button("Next ▶"):
+                if st.session_state.page < total_pages:
+                    st.session_state.page += 1
+                    st.rerun()
+                elif can_fetch and fetch_next_batch(base_url, auth):
+                    st.session_state.page += 1
+                    st.rerun()
+        
+        # Nearing the end of the loaded batch: fetch the next one ahead of time
+        if can_fetch and st.session_state.page >= total_pages - 1:
+            prefetch_next_batch(base_url, auth)
 
 # ========== MAIN APP ==========
 def main():
@@ -172,9 +413,15 @@ def main():
     
     # Store auth state when all fields are filled
     if base_url and username and password:
-        auth = HTTPBasicAuth(username, password)
+        # Build the auth object once per credentials, not on every rerun
+        auth_key = (username, password)
+        if st.session_state.get('_auth_key') != auth_key:
+            st.session_state._auth_key = auth_key
+            st.session_state._auth = HTTPBasicAuth(username, password)
+        auth = st.session_state._auth
         st.session_state.auth_verified = True
     else:
+        auth = None
         st.session_state.auth_verified = False
     
     # Main search
@@ -183,24 +430,40 @@ def main():
     if query and st.session_state.auth_verified:
         with st.spinner(f"Searching for '{query}'..."):
             try:
-                issues = search_jira(base_url, query, auth)
-                st.session_state.raw_results = issues
-                st.session_state.filtered_results = issues
-                st.session_state.page = 1  # Reset to first page
+                run_search(base_url, auth, query)
+            except AuthError:
+                st.error("Authentication failed - check your username and password")
+                return
             except Exception as e:
                 st.error(f"Search failed: {str(e)}")
                 return
     
     # Show filters and results if available
-    if st.session_state.raw_results:
-        st.session_state.filtered_results = show_results_filters(st.session_state.raw_results)
-        st.markdown(f"**Found {len(st.session_state.raw_results)} results** ({len(st.session_state.filtered_results)} after filtering)")
+    if st.session_state.results_df is not None:
+        filters = show_results_filters()
+        loaded = st.session_state.loaded_filters
+        # Serve narrower filters from the loaded batch where possible;
+        # otherwise let Jira's index do the filtering
+        if auth is not None and filters != loaded and needs_server_filter(loaded, filters):
+            with st.spinner("Applying filters..."):
+                try:
+                    run_search(base_url, auth, st.session_state.last_query, filters)
+                except Exception as e:
+                    st.error(f"Search failed: {str(e)}")
+        st.session_state.filtered_results = apply_filters(st.session_state.results_df, filters)
+        st.markdown(f"**Found {st.session_state.total_results} results** "
+                    f"({len(st.session_state.raw_results)} loaded, "
+                    f"{len(st.session_state.filtered_results)} after filtering)")
+        
+        # A fetched batch may add no matches for the current filters
+        total_pages = max(1, -(-len(st.session_state.filtered_results) // RESULTS_PER_PAGE))
+        st.session_state.page = min(st.session_state.page, total_pages)
         
-        if st.session_state.filtered_results:
-            display_results(st.session_state.filtered_results, base_url)
-            show_pagination(len(st.session_state.filtered_results))
+        if len(st.session_state.filtered_results):
+            display_results(st.session_state.filtered_results, base_url, auth)
         else:
             st.warning("No results match your filters")
+        show_pagination(len(st.session_state.filtered_results), base_url, auth, filters[2])
 
 if __name__ == "__main__":
     main()
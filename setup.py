@@ -5,7 +5,6 @@ setup(
     version="0.1",
     install_requires=[
         "streamlit>=1.28.0",
-        "sentence-transformers>=2.2.0",
         # other dependencies
     ],
 )